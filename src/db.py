@@ -280,11 +280,12 @@ class Db():
 
         return d
 
-    def exec_query(self, query_stmt: str) -> list:
+    def exec_query(self, query_stmt: str, parameters: tuple = None) -> list:
         """Execute Cassandra query
 
         Args:
             query_stmt: CQL query
+            parameters: values for the query's %s placeholders
 
         Returns:
             List of rows or empty list
@@ -292,12 +293,9 @@ class Db():
         try:
             with self.cluster.connect() as session:
                 session.row_factory = cassandra.query.ordered_dict_factory
-                rows = session.execute(query_stmt)
-
-                return rows.current_rows if hasattr(rows,
-                                                    "current_rows") else []
-        except (cassandra.cluster.NoHostAvailable) as ex:
-            if hasattr(ex, "errors") and ex.errors:
+                rows = session.execute(query_stmt, parameters)
+        except cassandra.cluster.NoHostAvailable as ex:
+            if ex.errors:
                 for err, obj in ex.errors.items():
                     msg = "Host {} responded with '{}'".format(err, str(obj))
                     if isinstance(obj, cassandra.cluster.ConnectionShutdown):
@@ -305,14 +303,10 @@ class Db():
                         msg += "Is SSL/TLS required to connect to the host?"
                     print(msg)
             else:
-                logging.exception(ex)
+                logging.exception("Connection to Cassandra failed")
             raise Exception("Connection failed")
 
-        except Exception as ex:
-            logging.exception(ex)
-            raise
-
-        return []
+        return rows.current_rows if hasattr(rows, "current_rows") else []
 
     def check_connection(self) -> bool:
         """Test Cassandra connectivity
@@ -362,9 +356,9 @@ class Db():
         table_configs = []
 
         query_stmt = "SELECT * FROM system_schema.tables " \
-                     "WHERE keyspace_name = '{}';".format(keyspace_name)
+                     "WHERE keyspace_name = %s;"
 
-        rows = self.exec_query(query_stmt)
+        rows = self.exec_query(query_stmt, (keyspace_name,))
         for row in rows:
             tbl = {}
             for key, val in row.items():
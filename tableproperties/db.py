@@ -2,21 +2,37 @@
 """ Database interface
 """
 from abc import abstractmethod, ABC
+import atexit
 import configparser
 import os
+import re
 import ssl
+import sys
 from typing import Any, Dict, List, Optional
 
-from cassandra import __version__ as cassver, auth, cluster, query, util, policies
+from cassandra import __version__ as cassver, auth, cluster, query, policies
+from cassandra.util import OrderedMapSerializedKey, SortedSet
 
 DEFAULT_HOST = '127.0.0.1'
 DEFAULT_NATIVE_CQL_PORT = 9042
 
 MAPPED_FIELD_NAMES = {"keyspace_name": "name", "table_name": "name"}
 
+ALL_TABLES_QUERY = "SELECT * FROM system_schema.tables;"
+
+# Numeric string patterns. Checked before calling int() or float() so that
+# the common non-numeric values do not raise and catch a ValueError.
+INT_PATTERN = re.compile(r"^[-+]?\d+$")
+FLOAT_PATTERN = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+
 
 class ConnectionParams():
     """ Cassandra connection parameters """
+    __slots__ = ("_host", "_port", "_lbp", "_ssl_required",
+                 "_client_cert_filename", "_client_key_filename",
+                 "_ssl_context", "_ssl_options", "_username", "_password",
+                 "_auth_provider")
+
     def __init__(self,
                  host: str = DEFAULT_HOST,
                  port: int = DEFAULT_NATIVE_CQL_PORT,
@@ -87,8 +103,8 @@ class ConnectionParams():
     @property
     def load_balancing_policy(self) -> policies.LoadBalancingPolicy:
         """ Get the load balancing policy """
-        return self._lbp if self._lbp else policies.WhiteListRoundRobinPolicy(
-            [self._host])
+        return self._lbp if self._lbp else policies.TokenAwarePolicy(
+            policies.WhiteListRoundRobinPolicy([self._host]))
 
     @load_balancing_policy.setter
     def load_balancing_policy(self, value: policies.LoadBalancingPolicy):
@@ -211,7 +227,8 @@ class ConnectionParams():
         password = rc_config.get("authentication", "password", fallback=None)
         key_file = rc_config.get("ssl", "userkey", fallback=None)
         cert_file = rc_config.get("ssl", "usercert", fallback=None)
-        lbp = policies.WhiteListRoundRobinPolicy([host])
+        lbp = policies.TokenAwarePolicy(
+            policies.WhiteListRoundRobinPolicy([host]))
 
         return ConnectionParams(host=host,
                                 port=port,
@@ -254,6 +271,22 @@ class Db(AbstractDb):
             # driver versions < 3.17.0 do not have support for ssl_context
             self.cluster.ssl_options = self._params.ssl_options
 
+        self._session = None  # type: Optional[cluster.Session]
+
+    @property
+    def session(self) -> cluster.Session:
+        """Get the session, connecting on first use
+
+        The session is shared by all queries issued through this instance.
+        Setting up the cluster connection is far more expensive than the
+        schema queries themselves.
+        """
+        if not self._session:
+            self._session = self.cluster.connect()
+            self._session.row_factory = query.ordered_dict_factory
+            atexit.register(self.cluster.shutdown)
+        return self._session
+
     @staticmethod
     def convert_value(val: Any) -> Any:
         """Convert a string to correct int or float where possible
@@ -267,17 +300,11 @@ class Db(AbstractDb):
         if not isinstance(val, str):
             return val
 
-        try:
-            num_int = int(val)
-            return num_int
-        except ValueError:
-            pass
+        if INT_PATTERN.match(val):
+            return int(val)
 
-        try:
-            num_float = float(val)
-            return num_float
-        except ValueError:
-            pass
+        if FLOAT_PATTERN.match(val):
+            return float(val)
 
         return val
 
@@ -291,23 +318,63 @@ class Db(AbstractDb):
         Returns:
             Dictionary with converted object properties
         """
-        return {key: Db.convert_value(val) for key, val in subconfig.items()} \
-            if isinstance(subconfig, util.OrderedMapSerializedKey) else {}
+        return Db._convert_map(subconfig) \
+            if isinstance(subconfig, OrderedMapSerializedKey) else {}
+
+    @staticmethod
+    def _convert_map(subconfig) -> dict:
+        """Convert mapped properties without checking their type
 
-    def exec_query(self, query_stmt: str) -> list:
+        Args:
+            subconfig: Mapping properties known to be an ordered map
+
+        Returns:
+            Dictionary with converted object properties
+        """
+        convert_value = Db.convert_value
+        intern = sys.intern
+
+        # Map keys are deserialized for every row. Intern them so all
+        # tables share one string per key. Class names are never numeric.
+        return {
+            intern(key): val if key == "class" else convert_value(val)
+            for key, val in subconfig.items()
+        }
+
+    @staticmethod
+    def is_system_keyspace(keyspace_name: str) -> bool:
+        """Check for Cassandra's internal keyspaces
+
+        Args:
+            keyspace_name: Keyspace name
+
+        Returns:
+            True if the keyspace is a system keyspace. False otherwise
+        """
+        return keyspace_name == "system" or \
+            keyspace_name.startswith("system_")
+
+    def exec_query(self, query_stmt: str) -> cluster.ResultSet:
         """Execute Cassandra query
 
         Args:
             query_stmt: CQL query
 
         Returns:
-            List of rows or empty list
+            Result set. Further pages are fetched while iterating over it
         """
-        with self.cluster.connect() as session:
-            session.row_factory = query.ordered_dict_factory
-            rows = session.execute(query_stmt)
+        return self.session.execute(query_stmt)
 
-            return rows.current_rows if hasattr(rows, "current_rows") else []
+    def exec_query_async(self, query_stmt: str) -> cluster.ResponseFuture:
+        """Execute Cassandra query without waiting for the result
+
+        Args:
+            query_stmt: CQL query
+
+        Returns:
+            Future of the query result
+        """
+        return self.session.execute_async(query_stmt)
 
     def check_connection(self) -> bool:
         """Test Cassandra connectivity
@@ -315,7 +382,35 @@ class Db(AbstractDb):
         Returns:
             True if connection was successful. False otherwise
         """
-        return self.exec_query("SELECT cql_version FROM system.local;") != []
+        return self.exec_query(
+            "SELECT cql_version FROM system.local;").one() is not None
+
+    @staticmethod
+    def convert_rows(rows, skip_keys: tuple = ()) -> List[Dict[str, Any]]:
+        """Convert system_schema rows to keyspace or table properties
+
+        Args:
+            rows:      Keyspace or table rows
+            skip_keys: columns to omit
+
+        Returns:
+            List of properties
+        """
+        # Local names for lookups in the loop
+        ordered_map = OrderedMapSerializedKey
+        sorted_set = SortedSet
+        convert_map = Db._convert_map
+        map_field_name = MAPPED_FIELD_NAMES.get
+        intern = sys.intern
+
+        return [{
+            intern(map_field_name(key, key)):
+            convert_map(val) if isinstance(val, ordered_map)
+            else list(val) if key == "flags" and isinstance(val, sorted_set)
+            else str(val) if key == "id"
+            else val
+            for key, val in row.items() if key not in skip_keys
+        } for row in rows]
 
     def get_keyspace_configs(self) -> dict:
         """Retrieve all keyspace properties.
@@ -323,61 +418,55 @@ class Db(AbstractDb):
         Returns:
             Dictionary with keyspace settings.
         """
-        keyspace_configs = []
-
         rows = self.exec_query("SELECT * FROM system_schema.keyspaces;")
-        for row in rows:
-            # Skip system tables.
-            if row.get("keyspace_name").startswith("system"):
-                continue
-
-            keyspace = {}
-            for key, val in row.items():
-                mapped_key = MAPPED_FIELD_NAMES.get(key, key)
 
-                if isinstance(val, util.OrderedMapSerializedKey):
-                    val = Db.convert_mapped_props(val)
-                elif key == "flags":
-                    val = list(val) if \
-                        isinstance(val, util.SortedSet) else val
-                keyspace[mapped_key] = val
-            keyspace_configs.append(keyspace)
+        # Skip system keyspaces.
+        keyspace_configs = Db.convert_rows(
+            row for row in rows
+            if not Db.is_system_keyspace(row.get("keyspace_name")))
 
         return {"keyspaces": keyspace_configs}
 
-    def get_table_configs(self, keyspace_name: str,
-                          drop_ids: bool) -> List[Dict[str, Any]]:
-        """Retrieve table properties
+    @staticmethod
+    def convert_table_rows(rows, drop_ids: bool) -> List[Dict[str, Any]]:
+        """Convert system_schema.tables rows to table properties
 
         Args:
-            keyspace_name: Keyspace name
+            rows:     Table rows
+            drop_ids: flag whether to omit table ids
 
         Returns:
-            Table properties in dictionary
+            List of table properties
         """
-        table_configs = []
+        skip_keys = ("keyspace_name", "id") if drop_ids \
+            else ("keyspace_name",)
 
-        query_stmt = "SELECT * FROM system_schema.tables " \
-                     "WHERE keyspace_name = '{}';".format(keyspace_name)
+        return Db.convert_rows(rows, skip_keys)
 
-        rows = self.exec_query(query_stmt)
+    @staticmethod
+    def group_table_rows(rows,
+                         drop_ids: bool) -> Dict[str, List[Dict[str, Any]]]:
+        """Convert system_schema.tables rows and group them by keyspace
+
+        Args:
+            rows:     Table rows of any number of keyspaces
+            drop_ids: flag whether to omit table ids
+
+        Returns:
+            Dictionary of table properties by keyspace name
+        """
+        rows_by_keyspace = {}  # type: Dict[str, list]
         for row in rows:
-            tbl = {}
-            for key, val in row.items():
-                if key == "keyspace_name" or (key == "id" and drop_ids):
-                    continue
-                elif isinstance(val, util.OrderedMapSerializedKey):
-                    val = Db.convert_mapped_props(val)
-                elif key == "flags":
-                    val = list(val) \
-                        if isinstance(val, util.SortedSet) else val
-                elif key == "id":
-                    val = str(val)
-                tbl[MAPPED_FIELD_NAMES.get(key, key)] = val
-
-            table_configs.append(tbl)
-
-        return table_configs
+            keyspace_name = row.get("keyspace_name")
+            # Don't convert tables of system keyspaces, they are dropped
+            if Db.is_system_keyspace(keyspace_name):
+                continue
+            rows_by_keyspace.setdefault(keyspace_name, []).append(row)
+
+        return {
+            keyspace_name: Db.convert_table_rows(keyspace_rows, drop_ids)
+            for keyspace_name, keyspace_rows in rows_by_keyspace.items()
+        }
 
     def get_current_config(self,
                            drop_ids: bool = False) -> Optional[Dict[Any, Any]]:
@@ -389,13 +478,18 @@ class Db(AbstractDb):
         Returns:
             Dictionary with keyspace and table properties or None
         """
+        # A single scan of all tables is cheaper than one query per
+        # keyspace. Send it before retrieving the keyspaces so both
+        # queries are in flight at the same time.
+        tables_future = self.exec_query_async(ALL_TABLES_QUERY)
+
         keyspace_config = self.get_keyspace_configs()
         keyspaces = keyspace_config.get("keyspaces")
         if not keyspaces:
             return None
 
-        for keyspace in keyspace_config.get("keyspaces", []):
-            keyspace["tables"] = self.get_table_configs(
-                keyspace.get("name"), drop_ids)
+        table_configs = Db.group_table_rows(tables_future.result(), drop_ids)
+        for keyspace in keyspaces:
+            keyspace["tables"] = table_configs.get(keyspace.get("name"), [])
 
         return keyspace_config
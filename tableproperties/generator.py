@@ -9,12 +9,11 @@ from tableproperties import utils
 
 def do_class_names_match(src_class: str, dst_class: str) -> bool:
     if src_class and dst_class:
-        src_class_arr = src_class.split(".")
-        dst_class_arr = dst_class.split(".")
-        if len(src_class_arr) == len(dst_class_arr):
-            return sorted(src_class_arr) == sorted(dst_class_arr)
+        if src_class.count(".") == dst_class.count("."):
+            return sorted(src_class.split(".")) == sorted(dst_class.split("."))
 
-        return src_class_arr[-1] == dst_class_arr[-1]
+        # Compare the unqualified class names
+        return src_class.rpartition(".")[2] == dst_class.rpartition(".")[2]
     if src_class or dst_class:
         # Only one class name was provided
         return False
@@ -1,11 +1,83 @@
 # pylint: disable=missing-docstring, invalid-name, no-self-use
+from collections import OrderedDict
+
 import pytest
 
-from cassandra import policies
+from cassandra import cluster, cqltypes, policies, util
 
 import tableproperties.db as db
 
 
+class PagedResponseFuture():
+    """ Stand-in for the driver's ResponseFuture serving further pages """
+    _col_names = None
+    _col_types = None
+    _continuous_paging_session = None
+
+    def __init__(self, pages):
+        self._pages = list(pages)
+        self._result = None
+
+    @property
+    def has_more_pages(self):
+        return bool(self._pages)
+
+    def start_fetching_next_page(self):
+        self._result = cluster.ResultSet(self, self._pages.pop(0))
+
+    def result(self):
+        return self._result
+
+
+def paged_result(*pages):
+    return cluster.ResultSet(PagedResponseFuture(pages[1:]), pages[0])
+
+
+class PagedSession():
+    """ Session stub returning multi-page results """
+    def __init__(self, keyspace_pages, table_pages):
+        self._keyspace_pages = keyspace_pages
+        self._table_pages = table_pages
+
+    def execute(self, query_stmt):
+        assert "keyspaces" in query_stmt
+        return paged_result(*self._keyspace_pages)
+
+    def execute_async(self, query_stmt):
+        assert "tables" in query_stmt
+        future = PagedResponseFuture([])
+        future._result = paged_result(*self._table_pages)
+        return future
+
+
+def keyspace_row(name):
+    return OrderedDict([("keyspace_name", name), ("durable_writes", True)])
+
+
+def table_row(keyspace_name, name):
+    return OrderedDict([("keyspace_name", keyspace_name),
+                        ("table_name", name), ("comment", "")])
+
+
+def ordered_map(values):
+    props = util.OrderedMapSerializedKey(cqltypes.UTF8Type, 4)
+    for key, val in values.items():
+        props._insert_unchecked(key, key.encode(), val)  # pylint: disable=protected-access
+    return props
+
+
+def full_table_row(keyspace_name, name, table_id):
+    row = table_row(keyspace_name, name)
+    row["id"] = table_id
+    row["flags"] = util.SortedSet(["compound"])
+    row["compaction"] = ordered_map({
+        "class": "org.apache.cassandra.db.compaction."
+                 "SizeTieredCompactionStrategy",
+        "max_threshold": "32"})
+    row["crc_check_chance"] = 1.0
+    return row
+
+
 # pylint: disable=too-few-public-methods
 class TestDb():
     def test_default_database(self, default_database):
@@ -18,9 +90,92 @@ class TestDb():
         assert d.convert_value(1) == 1
         assert d.convert_value("1") == 1
         assert d.convert_value("2.0") == 2.0
+        assert d.convert_value("-3") == -3
+        assert d.convert_value("1e3") == 1000.0
+        assert d.convert_value(".5") == 0.5
         assert d.convert_value("test") == "test"
+        assert d.convert_value("99PERCENTILE") == "99PERCENTILE"
         assert d.convert_value([1, 2]) == [1, 2]
 
+    def test_convert_mapped_props(self):
+        props = db.Db.convert_mapped_props(ordered_map({
+            "class": "org.apache.cassandra.io.compress.LZ4Compressor",
+            "chunk_length_in_kb": "64",
+            "crc_check_chance": "0.5"}))
+        assert props == {
+            "class": "org.apache.cassandra.io.compress.LZ4Compressor",
+            "chunk_length_in_kb": 64,
+            "crc_check_chance": 0.5}
+        assert db.Db.convert_mapped_props({"chunk_length_in_kb": "64"}) == {}
+
+    def test_convert_table_rows(self):
+        tables = db.Db.convert_table_rows(
+            [full_table_row("ks1", "a", 7)], False)
+        assert tables == [{
+            "name": "a",
+            "comment": "",
+            "id": "7",
+            "flags": ["compound"],
+            "compaction": {
+                "class": "org.apache.cassandra.db.compaction."
+                         "SizeTieredCompactionStrategy",
+                "max_threshold": 32},
+            "crc_check_chance": 1.0}]
+
+        tables = db.Db.convert_table_rows(
+            [full_table_row("ks1", "a", 7)], True)
+        assert "id" not in tables[0]
+        assert "keyspace_name" not in tables[0]
+
+    def test_group_table_rows(self):
+        groups = db.Db.group_table_rows([
+            full_table_row("system", "local", 1),
+            full_table_row("system_schema", "tables", 2),
+            full_table_row("ks1", "a", 3),
+            full_table_row("ks2", "b", 4),
+            full_table_row("ks1", "c", 5)], True)
+        assert sorted(groups) == ["ks1", "ks2"]
+        assert [tbl["name"] for tbl in groups["ks1"]] == ["a", "c"]
+        assert [tbl["name"] for tbl in groups["ks2"]] == ["b"]
+
+    def test_current_config_keyspace_without_tables(self):
+        d = db.Db()
+        d._session = PagedSession(  # pylint: disable=protected-access
+            [[keyspace_row("ks1"), keyspace_row("empty")]],
+            [[table_row("ks1", "a")]])
+        config = d.get_current_config()
+        assert config["keyspaces"][1]["name"] == "empty"
+        assert config["keyspaces"][1]["tables"] == []
+
+    def test_is_system_keyspace(self):
+        assert db.Db.is_system_keyspace("system")
+        assert db.Db.is_system_keyspace("system_schema")
+        assert db.Db.is_system_keyspace("system_auth")
+        assert not db.Db.is_system_keyspace("systems_inventory")
+        assert not db.Db.is_system_keyspace("excalibur")
+
+    def test_exec_query_reads_all_pages(self):
+        d = db.Db()
+        d._session = PagedSession(  # pylint: disable=protected-access
+            [[keyspace_row("ks1")], [keyspace_row("ks2")]], [[]])
+        rows = d.exec_query("SELECT * FROM system_schema.keyspaces;")
+        assert [row["keyspace_name"] for row in rows] == ["ks1", "ks2"]
+
+    def test_current_config_reads_all_pages(self):
+        d = db.Db()
+        d._session = PagedSession(  # pylint: disable=protected-access
+            [[keyspace_row("system"), keyspace_row("ks1")],
+             [keyspace_row("ks2")]],
+            [[table_row("system", "local"), table_row("ks1", "a")],
+             [table_row("ks1", "b")],
+             [table_row("ks2", "c")]])
+        config = d.get_current_config()
+        assert [ks["name"] for ks in config["keyspaces"]] == ["ks1", "ks2"]
+        assert [tbl["name"] for tbl in config["keyspaces"][0]["tables"]] \
+            == ["a", "b"]
+        assert [tbl["name"] for tbl in config["keyspaces"][1]["tables"]] \
+            == ["c"]
+
     def test_bad_host(self):
         with pytest.raises(Exception):
             d = db.Db(db.ConnectionParams(host="127.0.0.2"))
@@ -36,6 +191,12 @@ class TestConnectionParams():
         assert not cp.is_ssl_required
         assert cp.ssl_context is None
 
+    def test_no_instance_dict(self):
+        cp = db.ConnectionParams()
+        assert not hasattr(cp, "__dict__")
+        with pytest.raises(AttributeError):
+            cp.hostname = "testhost"  # pylint: disable=assigning-non-slot
+
     def test_change_defaults_using_setters(self):
         cp = db.ConnectionParams()
         cp.host = "testhost"
@@ -47,7 +208,9 @@ class TestConnectionParams():
         cp = db.ConnectionParams()
         cp.host = "127.0.0.1"
         assert cp.load_balancing_policy is not None
-        assert isinstance(cp.load_balancing_policy, policies.WhiteListRoundRobinPolicy)
+        assert isinstance(cp.load_balancing_policy, policies.TokenAwarePolicy)
+        assert isinstance(cp.load_balancing_policy._child_policy,  # pylint: disable=protected-access
+                          policies.WhiteListRoundRobinPolicy)
         cp.load_balancing_policy = policies.RoundRobinPolicy()
         assert isinstance(cp.load_balancing_policy, policies.RoundRobinPolicy)
 
@@ -81,5 +81,8 @@ class TestGenerator:
         assert not gen.do_class_names_match(
             "org.apache.cassandra.locator.SimpleStrategy",
             "org.apache.cassandra.locator1.SimpleStrategy")
+        assert not gen.do_class_names_match(
+            "org.apache.cassandra.locator.SimpleStrategy",
+            "NetworkTopologyStrategy")
         assert gen.do_class_names_match("", "")
         assert gen.do_class_names_match(None, None)